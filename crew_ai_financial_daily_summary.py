@@ -1,16 +1,28 @@
 import os
+import re
 import json
-import time
+import asyncio
+import hashlib
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
 from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import List, Dict, Any, Optional
+from datetime import datetime
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple
+from urllib.parse import urlsplit
 
+import orjson
 import requests
-from reportlab.lib.pagesizes import letter
-from reportlab.pdfgen import canvas
-from reportlab.lib.utils import ImageReader
-from PIL import Image
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# aiohttp, requests_toolbelt, tenacity, reportlab and Pillow are imported where they are used
+# so `--help` and other partial callers don't pay their import time.
+if TYPE_CHECKING:
+    import aiohttp
+    from PIL import Image
 
 
 SERPER_API_KEY = os.getenv("SERPER_API_KEY", "")  
@@ -21,20 +33,69 @@ TELEGRAM_CHANNEL_ID = os.getenv("TELEGRAM_CHANNEL_ID", "")
 
 CREWAI_FLOW_NAME = "financial_daily_summary"
 LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")  
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", ".llm_cache")
+STATE_DIR = os.getenv("STATE_DIR", ".state")
+PDF_UNICODE_FONT = os.getenv("PDF_UNICODE_FONT", "")  # TTF with Arabic/Hebrew glyphs for RTL sections
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# One pooled, keep-alive session for every blocking HTTP call (LLM, images, Telegram).
+SESSION = requests.Session()
+_adapter = HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    # connection errors are left to the callers: litellm_generate retries them itself and
+    # would otherwise multiply the adapter's attempts
+    max_retries=Retry(total=2, connect=0, backoff_factor=0.3, status_forcelist=[502, 503, 504]),
+)
+SESSION.mount("https://", _adapter)
+SESSION.mount("http://", _adapter)
 
-def litellm_generate(prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+
+class LLMError(Exception):
     """
-    Minimal wrapper to call Litellm (or placeholder). Replace with real SDK calls
-    depending on the "litellm" library you have. This function returns the model text.
+    The LLM endpoint kept failing after retries. Raised instead of returning error text so the
+    flow stops before translating and rendering a broken summary.
     """
-    if not LITELLM_API_KEY:
-        logger.warning("LITELLM_API_KEY not set — returning mock response for testing.")
-        return "[MOCK LLM RESPONSE] " + (prompt[:400] + "...")
 
+
+def _llm_cache_path(prompt: str, max_tokens: int, temperature: float) -> Optional[str]:
+    """
+    Path of the on-disk cache entry for this request, or None when the output is not deterministic.
+    """
+    if temperature > 0:
+        return None
+    key = hashlib.sha256(json.dumps(
+        {"m": LLM_MODEL, "p": prompt, "t": temperature, "mt": max_tokens}, sort_keys=True
+    ).encode("utf-8")).hexdigest()
+    return os.path.join(LLM_CACHE_DIR, key)
+
+
+def _atomic_write(path: str, text: str):
+    # write to a temp file and rename so a crashed run never leaves a truncated file behind
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except OSError:
+        logger.exception("Failed writing %s", path)
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _is_transient_llm_error(exc: BaseException) -> bool:
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return False
+
+
+def _litellm_generate_raw(prompt: str, max_tokens: int, temperature: float) -> Dict[str, Any]:
     url = ""# REPLACE with real endpoint
     payload = {
         "model": LLM_MODEL,
@@ -43,18 +104,52 @@ def litellm_generate(prompt: str, max_tokens: int = 512, temperature: float = 0.
         "temperature": temperature,
     }
     headers = {"Authorization": f"Bearer {LITELLM_API_KEY}", "Content-Type": "application/json"}
+    r = SESSION.post(url, data=orjson.dumps(payload), headers=headers, timeout=20)
+    r.raise_for_status()
+    return orjson.loads(r.content)
+
+
+def litellm_generate(prompt: str, max_tokens: int = 512, temperature: float = 0.0) -> str:
+    """
+    Minimal wrapper to call Litellm (or placeholder). Replace with real SDK calls
+    depending on the "litellm" library you have. This function returns the model text.
+    Timeouts, connection errors, 429 and 5xx are retried with jittered backoff; raises LLMError
+    once retries are exhausted or on any other failure.
+    """
+    if not LITELLM_API_KEY:
+        logger.warning("LITELLM_API_KEY not set — returning mock response for testing.")
+        return "[MOCK LLM RESPONSE] " + (prompt[:400] + "...")
+
+    cache_path = _llm_cache_path(prompt, max_tokens, temperature)
+    if cache_path and os.path.exists(cache_path):
+        logger.info("LLM cache hit %s", os.path.basename(cache_path))
+        with open(cache_path, encoding="utf-8") as f:
+            return f.read()
+
+    from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential_jitter
+
+    retrying = Retrying(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential_jitter(initial=0.5, max=8),
+        retry=retry_if_exception(_is_transient_llm_error),
+        reraise=True,
+    )
     try:
-        r = requests.post(url, json=payload, headers=headers, timeout=20)
-        r.raise_for_status()
-        data = r.json()
-        return data.get("text") or data.get("generated_text") or json.dumps(data)
+        data = retrying(_litellm_generate_raw, prompt, max_tokens, temperature)
     except Exception as e:
-        logger.exception("LLM request failed")
-        return "[LLM_ERROR] " + str(e)
+        raise LLMError(f"LLM request failed: {e}") from e
+    text = (data.get("text") or data.get("generated_text")) if isinstance(data, dict) else None
+    if not text:
+        # unexpected payload (provider error, other response shape): pass it on but never cache it
+        logger.warning("LLM reply has no text field; not caching it")
+        return orjson.dumps(data).decode("utf-8")
+    if cache_path:
+        _atomic_write(cache_path, text)
+    return text
 
 
 
-def search_serper(query: str, num_results: int = 5) -> List[Dict[str, Any]]:
+async def _search_serper_async(session: "aiohttp.ClientSession", query: str, num_results: int = 5) -> List[Dict[str, Any]]:
     """
     Simple Serper search (replace endpoint/key as needed). Returns list of {title, link, snippet, image}
     """
@@ -70,9 +165,12 @@ def search_serper(query: str, num_results: int = 5) -> List[Dict[str, Any]]:
     url = "https://api.serper.dev/search"
     headers = {"X-API-KEY": SERPER_API_KEY, "Content-Type": "application/json"}
     payload = {"q": query, "num": num_results}
-    r = requests.post(url, json=payload, headers=headers, timeout=15)
-    r.raise_for_status()
-    data = r.json()
+    import aiohttp
+
+    timeout = aiohttp.ClientTimeout(total=15)
+    async with session.post(url, data=orjson.dumps(payload), headers=headers, timeout=timeout) as r:
+        r.raise_for_status()
+        data = orjson.loads(await r.read())
     results = []
     for item in data.get("organic", [])[:num_results]:
         results.append({
@@ -84,51 +182,85 @@ def search_serper(query: str, num_results: int = 5) -> List[Dict[str, Any]]:
     return results
 
 
-def search_tavily(query: str, num_results: int = 5) -> List[Dict[str, Any]]:
-    
-    if not TAVILY_API_KEY:
-        return search_serper(query, num_results)
+async def _search_tavily_async(session: "aiohttp.ClientSession", query: str, num_results: int = 5) -> List[Dict[str, Any]]:
+    # If you have Tavily API details, implement here (using TAVILY_API_KEY) and add this search to
+    # search_agent_us_financial_news. Until then it only falls back to Serper.
+    return await _search_serper_async(session, query, num_results)
 
-    # If you have Tavily API details, implement here
-    return search_serper(query, num_results)
 
+# One narrowly scoped query per intent ranks better than a single OR-joined query.
+SEARCH_QUERIES = (
+    "US stock market today S&P 500 Nasdaq Dow",
+    "US earnings reports today Wall Street",
+)
 
-def search_agent_us_financial_news() -> List[Dict[str, Any]]:
+
+def _dedupe_key(r: Dict[str, Any]) -> str:
     """
-    Search agent: fetch US financial news from the last hour. This function tries both Tavily
-    and Serper and merges results.
+    Canonical link (lower-cased host, no fragment or trailing slash), or the title when there is no link.
     """
-    # Build a time-aware query: markets close ~16:00 ET -> we want last hour of news about US markets.
-    now = datetime.now(timezone.utc)
-    query = "US markets news last hour OR " \
-            "Wall Street today OR S&P 500 NASDAQ Dow Jones earnings"
+    link = (r.get("link") or "").strip()
+    if not link:
+        return (r.get("title") or "").strip().lower()
+    parts = urlsplit(link)
+    # only scheme and host are case-insensitive; paths that differ in case can be different articles
+    key = f"{parts.scheme.lower()}://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+    return f"{key}?{parts.query}" if parts.query else key
+
+
+async def search_agent_us_financial_news(session: Optional["aiohttp.ClientSession"] = None) -> List[Dict[str, Any]]:
+    """
+    Search agent: fetch US financial news for the trading day. Each of SEARCH_QUERIES runs
+    concurrently on Serper and the results are merged.
+    Pass the flow's session to reuse its connections.
+    """
+    if session is None:
+        import aiohttp
+
+        async with aiohttp.ClientSession() as own_session:
+            return await search_agent_us_financial_news(own_session)
+
+    # Tavily is not wired in: _search_tavily_async has no client yet and would only repeat Serper calls
+    searches = [("Serper", _search_serper_async)]
+
+    jobs = [(name, query, search(session, query, num_results=5))
+            for name, search in searches for query in SEARCH_QUERIES]
+    logger.info("Running search_agent with queries: %s", list(SEARCH_QUERIES))
+    outcomes = await asyncio.gather(*(job for _, _, job in jobs), return_exceptions=True)
 
-    logger.info("Running search_agent with query: %s", query)
     results = []
-    try:
-        results += search_tavily(query, num_results=5)
-    except Exception:
-        logger.exception("Tavily search failed, falling back to Serper")
-    try:
-        results += search_serper(query, num_results=5)
-    except Exception:
-        logger.exception("Serper search failed")
-
-    # Simple dedupe by link
-    seen = set()
-    deduped = []
-    for r in results:
-        link = r.get("link") or r.get("title")
-        if link in seen:
-            continue
-        seen.add(link)
-        deduped.append(r)
+    for (name, query, _), outcome in zip(jobs, outcomes):
+        if isinstance(outcome, Exception):
+            logger.error("%s search failed for %r", name, query, exc_info=outcome)
+        else:
+            results += outcome
+
+    deduped = list({_dedupe_key(r): r for r in results}.values())
 
     logger.info("search_agent found %d unique results", len(deduped))
     return deduped
 
 
 
+_SUMMARY_PROMPT_TMPL = (
+    "You are a succinct financial news summarizer. Given the following search results from US financial news, "
+    "write a short, clear summary (under 500 words) focused on the most important market moves, drivers, "
+    "and trading activity. Use 3 short bullets and a 2-4 sentence paragraph. Do not invent facts; if uncertain, say 'reported'.\n\n"
+    "CONTEXT:\n{context}\n\nOUTPUT:\n"
+)
+_SUMMARY_MAX_TOKENS = 600
+
+
+def summary_context(results: List[Dict[str, Any]]) -> str:
+    """
+    Build the CONTEXT block the summary prompt is based on from the top 6 results.
+    """
+    context_lines = []
+    for i, r in enumerate(results[:6], start=1):
+        context_lines.append(f"{i}. {r.get('title')} - {r.get('snippet') or ''} ({r.get('link')})")
+    return "\n".join(context_lines)
+
+
 def summary_agent_generate(results: List[Dict[str, Any]]) -> str:
     """
     Generate a concise summary (< 500 words) using the LLM. We pass the top results as context
@@ -137,30 +269,47 @@ def summary_agent_generate(results: List[Dict[str, Any]]) -> str:
     if not results:
         return "No results found in the last hour."
 
-    context_lines = []
-    for i, r in enumerate(results[:6], start=1):
-        context_lines.append(f"{i}. {r.get('title')} - {r.get('snippet') or ''} ({r.get('link')})")
-    prompt = (
-        "You are a succinct financial news summarizer. Given the following search results from US financial news, "
-        "write a short, clear summary (under 500 words) focused on the most important market moves, drivers, "
-        "and trading activity. Use 3 short bullets and a 2-4 sentence paragraph. Do not invent facts; if uncertain, say 'reported'.\n\n"
-        "CONTEXT:\n" + "\n".join(context_lines) + "\n\nOUTPUT:\n"
-    )
-    out = litellm_generate(prompt, max_tokens=600, temperature=0.0)
+    prompt = _SUMMARY_PROMPT_TMPL.format(context=summary_context(results))
+    out = litellm_generate(prompt, max_tokens=_SUMMARY_MAX_TOKENS, temperature=0.0)
     return out
 
 
+# URLs that answered a probe OK. Failures are not remembered so a one-off timeout or 5xx
+# doesn't blacklist a host for the rest of the process.
+_REACHABLE_IMAGE_URLS = set()
+
+
+def _image_url_ok(url: str) -> bool:
+    """
+    Cheap HEAD probe so dead image hosts are dropped before create_pdf has to wait on them.
+    Hosts that refuse HEAD (403/405) are retried with a streamed GET that reads only the headers.
+    """
+    if url in _REACHABLE_IMAGE_URLS:
+        return True
+    try:
+        r = SESSION.head(url, timeout=4, allow_redirects=True)
+        ok = r.ok
+        if r.status_code in (403, 405):
+            with SESSION.get(url, stream=True, timeout=4) as g:
+                ok = g.ok
+    except requests.RequestException:
+        return False
+    if ok:
+        _REACHABLE_IMAGE_URLS.add(url)
+    return ok
+
+
 def select_images_from_results(results: List[Dict[str, Any]], max_images: int = 2) -> List[str]:
     """
-    Choose up to max_images URLs from search results. If results include no images, pick placeholders.
+    Choose up to max_images reachable URLs from search results. If results include no usable images,
+    pick placeholders.
     """
-    images = []
-    for r in results:
-        img = r.get("image")
-        if img:
-            images.append(img)
-        if len(images) >= max_images:
-            break
+    candidates = list(dict.fromkeys(r.get("image") for r in results if r.get("image")))
+    oks = []
+    if candidates:
+        with ThreadPoolExecutor(max_workers=min(len(candidates), 8)) as ex:
+            oks = list(ex.map(_image_url_ok, candidates))
+    images = [url for url, ok in zip(candidates, oks) if ok][:max_images]
     while len(images) < max_images:
         images.append(f"https://via.placeholder.com/800x400.png?text=Financial+Chart+{len(images)+1}")
     logger.info("Selected %d images", len(images))
@@ -168,7 +317,25 @@ def select_images_from_results(results: List[Dict[str, Any]], max_images: int =
 
 
 
-LANGUAGE_CODES = {"arabic": "ar", "hindi": "hi", "hebrew": "he"}
+LANGUAGE_CODES = MappingProxyType({"arabic": "ar", "hindi": "hi", "hebrew": "he"})
+
+# Languages the English summary is translated into, in PDF order.
+TARGET_LANGUAGES = ("arabic", "hindi", "hebrew")
+
+_TRANSLATE_PROMPT_TMPL = (
+    "Translate the following summary into {lang} (language code: {code}). \n"
+    "Preserve the original formatting (bullets, short paragraphs). Do not add or remove content.\n\n"
+    "ORIGINAL:\n{orig}\n\nTRANSLATED:\n"
+)
+_TRANSLATE_MAX_TOKENS = 800
+
+_TRANSLATE_BATCH_PROMPT_TMPL = (
+    "Translate the following summary into each of these languages: {targets}.\n"
+    "Return only a JSON object with the keys {keys} whose values are the translated summary. "
+    "Preserve the original formatting (bullets, short paragraphs). Do not add or remove content.\n\n"
+    "ORIGINAL:\n{orig}\n\nJSON:\n"
+)
+_TRANSLATE_BATCH_MAX_TOKENS = 2400
 
 
 def translating_agent_translate(text: str, target_lang: str) -> str:
@@ -176,129 +343,355 @@ def translating_agent_translate(text: str, target_lang: str) -> str:
     Translate the summary into target_lang using the LLM while preserving format (bullets, headings).
     """
     lang_code = LANGUAGE_CODES.get(target_lang.lower(), target_lang)
-    prompt = (
-        f"Translate the following summary into {target_lang} (language code: {lang_code}). \n"
-        "Preserve the original formatting (bullets, short paragraphs). Do not add or remove content.\n\n"
-        f"ORIGINAL:\n{text}\n\nTRANSLATED:\n"
-    )
-    translated = litellm_generate(prompt, max_tokens=800, temperature=0.0)
+    prompt = _TRANSLATE_PROMPT_TMPL.format(lang=target_lang, code=lang_code, orig=text)
+    translated = litellm_generate(prompt, max_tokens=_TRANSLATE_MAX_TOKENS, temperature=0.0)
     return translated
 
 
-def create_pdf(summary_texts_by_lang: Dict[str, str], images: List[str], out_path: str):
+def translating_agent_translate_batch(text: str, langs: List[str]) -> Dict[str, str]:
+    """
+    Translate the summary into every language in langs with a single LLM call. The model is asked
+    for a JSON object keyed by language; any language missing from the reply falls back to
+    translating_agent_translate.
+    """
+    targets = ", ".join(f"{lang} ({LANGUAGE_CODES.get(lang.lower(), lang)})" for lang in langs)
+    keys = ", ".join(f'"{lang}"' for lang in langs)
+    prompt = _TRANSLATE_BATCH_PROMPT_TMPL.format(targets=targets, keys=keys, orig=text)
+    out = litellm_generate(prompt, max_tokens=_TRANSLATE_BATCH_MAX_TOKENS, temperature=0.0)
+
+    parsed: Dict[str, Any] = {}
+    try:
+        parsed = json.loads(out)
+    except ValueError:
+        # models often wrap the object in prose or code fences; grab the first {...} block
+        match = re.search(r"\{.*\}", out, re.DOTALL)
+        if match:
+            try:
+                parsed = json.loads(match.group(0))
+            except ValueError:
+                pass
+    if not isinstance(parsed, dict):
+        parsed = {}
+
+    translations = {}
+    for lang in langs:
+        value = parsed.get(lang) or parsed.get(lang.lower())
+        if isinstance(value, str) and value.strip():
+            translations[lang] = value
+        else:
+            logger.warning("Batch translation missing %s; translating separately", lang)
+            translations[lang] = translating_agent_translate(text, lang)
+    return translations
+
+
+RTL_LANGUAGES = frozenset({"arabic", "hebrew"})
+
+
+@lru_cache(maxsize=None)
+def body_font(lang: str) -> str:
+    """
+    Font used for a section's body text. RTL sections use the TTF at PDF_UNICODE_FONT when set;
+    everything else (and RTL without that font) uses Helvetica, which has no Arabic or Hebrew
+    glyphs, so such text renders as empty boxes. Hindi is not shaped and always uses Helvetica.
+    """
+    if lang.lower() not in RTL_LANGUAGES or not PDF_UNICODE_FONT:
+        return "Helvetica"
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.ttfonts import TTFont
+
+    try:
+        pdfmetrics.registerFont(TTFont("UnicodeBody", PDF_UNICODE_FONT))
+    except Exception:
+        logger.exception("Failed registering PDF_UNICODE_FONT %s; using Helvetica", PDF_UNICODE_FONT)
+        return "Helvetica"
+    return "UnicodeBody"
+
+
+def _wrap_to_width(paragraph: str, max_width: float, font: str, size: float) -> List[str]:
+    """
+    Greedy word wrap measured with the font's real glyph widths. The paragraph's leading whitespace
+    (nested bullets, aligned columns) is kept as a hanging indent on every wrapped line. A single
+    word wider than max_width is kept on its own line rather than cut.
+
+    >>> _wrap_to_width("  - sub point", 500, "Helvetica", 11)
+    ['  - sub point']
+    >>> _wrap_to_width("    - one two three", 50, "Helvetica", 11)
+    ['    - one', '    two', '    three']
+    """
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+
+    paragraph = paragraph.expandtabs(4)
+    words = paragraph.split()
+    if not words:
+        return [""]
+    indent = paragraph[:len(paragraph) - len(paragraph.lstrip())]
+
+    out = []
+    cur = ""
+    for word in words:
+        trial = f"{cur} {word}" if cur else word
+        if stringWidth(indent + trial, font, size) <= max_width or not cur:
+            cur = trial
+        else:
+            out.append(indent + cur)
+            cur = word
+    out.append(indent + cur)
+    return out
+
+
+@lru_cache(maxsize=32)
+def layout_text_lines(lang: str, text: str, max_width: float) -> Tuple[str, ...]:
+    """
+    Wrap text into PDF lines no wider than max_width points (body_font(lang), 11pt) and, for RTL
+    languages, reshape and BiDi-reorder each line for display. Shaping only shows up in the PDF when
+    PDF_UNICODE_FONT provides the glyphs. Cached per (lang, text, max_width) so redrawing the same
+    section doesn't wrap or shape it again.
+    """
+    font = body_font(lang)
+    lines = []
+    for line in (text or "").split("\n"):
+        lines.extend(_wrap_to_width(line, max_width, font, 11))
+    if lang.lower() not in RTL_LANGUAGES:
+        return tuple(lines)
+
+    try:
+        from arabic_reshaper import reshape
+        from bidi.algorithm import get_display
+    except ImportError:
+        logger.warning("arabic-reshaper/python-bidi not installed; drawing %s text unshaped", lang)
+        return tuple(lines)
+    # wrap first so lines break in logical order, then shape each visual line
+    return tuple(get_display(reshape(line)) for line in lines)
+
+
+def _fetch_image(url: str) -> Optional["Image.Image"]:
+    """
+    Download an image and shrink it to fit the PDF slot. Returns None if the fetch or decode fails.
+    """
+    from io import BytesIO
+    from PIL import Image
+
+    try:
+        r = SESSION.get(url, timeout=15)
+        r.raise_for_status()
+        img = Image.open(BytesIO(r.content))
+        # JPEG fast path: let libjpeg decode at a reduced scale instead of full resolution
+        img.draft("RGB", (500, 300))
+        img.thumbnail((500, 300), Image.Resampling.BILINEAR)
+        return img
+    except Exception:
+        logger.exception("Failed fetching image %s", url)
+        return None
+
+
+def pdf_output_path(summary_texts_by_lang: Dict[str, str], images: List[str], today: str) -> str:
+    """
+    Content-addressed PDF filename: identical texts and images always map to the same file.
+    """
+    h = hashlib.sha1(orjson.dumps([summary_texts_by_lang, images])).hexdigest()[:8]
+    return f"daily_summary_{today}_{h}.pdf"
+
+
+def create_pdf(summary_texts_by_lang: Dict[str, str], images: List[str], out_path: str) -> str:
     """
     Create a PDF that contains: English summary first, then each translated language.
     Each section places images logically (we place the first image after the English header, second after first translated section).
     """
+    from reportlab.lib.pagesizes import letter
+    from reportlab.pdfgen import canvas
+    from reportlab.lib.utils import ImageReader
+
     c = canvas.Canvas(out_path, pagesize=letter)
     w, h = letter
     margin = 40
     y = h - margin
 
-    def draw_text_block(title: str, text: str):
+    def draw_text_block(title: str, text: str, lang: str = "english"):
         nonlocal y
         c.setFont("Helvetica-Bold", 14)
         c.drawString(margin, y, title)
         y -= 18
-        c.setFont("Helvetica", 11)
-        for line in text.split("\n"):
+        lines = list(layout_text_lines(lang, text, w - 2 * margin))
+        # one text object per page instead of one drawString per line
+        while lines:
             if y < margin + 50:
                 c.showPage()
                 y = h - margin
-            c.drawString(margin, y, line[:120])
-            y -= 14
+            fit = int((y - margin - 50) // 14) + 1
+            to = c.beginText(margin, y)
+            to.setFont(body_font(lang), 11)
+            to.setLeading(14)
+            to.textLines(lines[:fit], trim=0)
+            c.drawText(to)
+            y -= 14 * len(lines[:fit])
+            lines = lines[fit:]
         y -= 10
 
+    # download all images up front so network waits overlap instead of stalling the drawing
+    imgs: List[Optional["Image.Image"]] = []
+    if images:
+        with ThreadPoolExecutor(max_workers=min(len(images), 4)) as ex:
+            imgs = list(ex.map(_fetch_image, images))
+
     # English section
     eng = summary_texts_by_lang.get("english") or summary_texts_by_lang.get("en")
     draw_text_block("English Summary", eng)
 
     # place first image
-    try:
-        img_url = images[0]
-        r = requests.get(img_url, stream=True, timeout=15)
-        r.raise_for_status()
-        img = Image.open(r.raw)
-        img.thumbnail((500, 300))
-        c.drawInlineImage(ImageReader(img), margin, y - 310, width=500, height=300)
-        y -= 320
-    except Exception:
-        logger.exception("Failed drawing first image; skipping")
+    if imgs and imgs[0] is not None:
+        try:
+            c.drawImage(ImageReader(imgs[0]), margin, y - 310, width=500, height=300,
+                        preserveAspectRatio=True, mask="auto")
+            y -= 320
+        except Exception:
+            logger.exception("Failed drawing first image; skipping")
 
     # other languages
     for i, (lang, text) in enumerate(summary_texts_by_lang.items()):
         if lang.lower() in ("english", "en"):
             continue
-        draw_text_block(f"{lang.capitalize()} Summary", text)
+        draw_text_block(f"{lang.capitalize()} Summary", text, lang)
         # place second image after the first translated block
-        if i == 1 and len(images) > 1:
+        if i == 1 and len(imgs) > 1 and imgs[1] is not None:
             try:
-                img_url = images[1]
-                r = requests.get(img_url, stream=True, timeout=15)
-                r.raise_for_status()
-                img = Image.open(r.raw)
-                img.thumbnail((500, 300))
                 if y < margin + 320:
                     c.showPage()
                     y = h - margin
-                c.drawInlineImage(ImageReader(img), margin, y - 310, width=500, height=300)
+                c.drawImage(ImageReader(imgs[1]), margin, y - 310, width=500, height=300,
+                            preserveAspectRatio=True, mask="auto")
                 y -= 320
             except Exception:
                 logger.exception("Failed drawing second image; skipping")
 
     c.save()
     logger.info("PDF saved to %s", out_path)
+    return out_path
 
 
 def send_to_telegram(pdf_path: str, caption: str = "Daily Market Summary") -> bool:
+    """
+    Upload the PDF to the Telegram channel. A `<pdf_path>.sent` sentinel records a successful send
+    so reruns don't post the same report twice.
+    """
     if not TELEGRAM_BOT_TOKEN or not TELEGRAM_CHANNEL_ID:
         logger.warning("Telegram credentials not set. Skipping send.")
         return False
+    sentinel = pdf_path + ".sent"
+    if os.path.exists(sentinel):
+        logger.info("%s was already sent to Telegram; skipping", pdf_path)
+        return True
+    from requests_toolbelt.multipart.encoder import MultipartEncoder
+
     url = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendDocument"
     with open(pdf_path, "rb") as f:
-        files = {"document": f}
-        data = {"chat_id": TELEGRAM_CHANNEL_ID, "caption": caption}
-        r = requests.post(url, data=data, files=files, timeout=30)
+        # stream the multipart body from disk instead of buffering the whole PDF in memory
+        enc = MultipartEncoder(fields={
+            "chat_id": TELEGRAM_CHANNEL_ID,
+            "caption": caption,
+            "document": (os.path.basename(pdf_path), f, "application/pdf"),
+        })
+        r = SESSION.post(url, data=enc, headers={"Content-Type": enc.content_type}, timeout=60)
         if r.status_code == 200:
             logger.info("PDF sent to Telegram channel %s", TELEGRAM_CHANNEL_ID)
+            _atomic_write(sentinel, datetime.now().isoformat())
             return True
         else:
             logger.error("Telegram send failed: %s %s", r.status_code, r.text)
             return False
 
 
-def crewai_flow_run():
-    # guardrail: ensure we run only once per day (or per run) and capture errors
+def summarize_and_translate(results: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Run the summary agent and then the translating agent, returning texts keyed by language.
+    """
+    summary_en = summary_agent_generate(results)
+    translations = {"english": summary_en}
+    translations.update(translating_agent_translate_batch(summary_en, list(TARGET_LANGUAGES)))
+    return translations
+
+
+def _run_state_path(today: str) -> str:
+    return os.path.join(STATE_DIR, f"last_results_{today}.json")
+
+
+def load_run_state(today: str) -> Dict[str, Any]:
+    """
+    Checkpoint of today's last successful run: {context_hash, context, pdf}. Empty if there is none.
+    """
     try:
-        results = search_agent_us_financial_news()
-        if not results:
-            logger.warning("No results; ending run")
-            return False
+        with open(_run_state_path(today), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
 
+def save_run_state(today: str, state: Dict[str, Any]):
+    _atomic_write(_run_state_path(today), json.dumps(state, ensure_ascii=False, indent=2))
 
-        summary_en = summary_agent_generate(results)
 
-        images = select_images_from_results(results, max_images=2)
+async def flow_async() -> bool:
+    # guardrail: ensure we run only once per day (or per run) and capture errors
+    try:
+        import aiohttp
 
-        translations = {}
-        translations["english"] = summary_en
-        for lang in ["arabic", "hindi", "hebrew"]:
-            translations[lang] = translating_agent_translate(summary_en, lang)
-            time.sleep(0.5)
+        loop = asyncio.get_running_loop()
+        connector = aiohttp.TCPConnector(limit=20, ttl_dns_cache=300)
+        async with aiohttp.ClientSession(connector=connector) as session:
+            results = await search_agent_us_financial_news(session)
+        if not results:
+            logger.warning("No results; ending run")
+            return False
 
-        # create PDF
         today = datetime.now().strftime("%Y%m%d")
-        out_pdf = f"daily_summary_{today}.pdf"
-        create_pdf(translations, images, out_pdf)
+        context = summary_context(results)
+        # anything that changes the generated text must change the hash, not just the news
+        context_hash = hashlib.sha256(json.dumps([
+            LLM_MODEL, TARGET_LANGUAGES, dict(LANGUAGE_CODES),
+            _SUMMARY_PROMPT_TMPL, _TRANSLATE_BATCH_PROMPT_TMPL, _TRANSLATE_PROMPT_TMPL,
+            _SUMMARY_MAX_TOKENS, _TRANSLATE_BATCH_MAX_TOKENS, _TRANSLATE_MAX_TOKENS,
+            context,
+        ]).encode("utf-8")).hexdigest()
+        state = load_run_state(today)
+
+        if state.get("context_hash") == context_hash and os.path.exists(state.get("pdf", "")):
+            # same news as today's earlier run: the PDF would come out identical, so only resend it
+            out_pdf = state["pdf"]
+            logger.info("Search results unchanged since last run; reusing %s", out_pdf)
+        else:
+            # the LLM chain and image selection only depend on the search results, so overlap them
+            translations, images = await asyncio.gather(
+                loop.run_in_executor(None, summarize_and_translate, results),
+                loop.run_in_executor(None, select_images_from_results, results, 2),
+            )
+
+            # create PDF
+            out_pdf = pdf_output_path(translations, images, today)
+            if os.path.exists(out_pdf):
+                # content-addressed name: an existing file already holds exactly this report
+                logger.info("PDF %s already exists; skipping render", out_pdf)
+            else:
+                await loop.run_in_executor(None, create_pdf, translations, images, out_pdf)
+            if LITELLM_API_KEY:
+                save_run_state(today, {"context_hash": context_hash, "context": context, "pdf": out_pdf})
+            else:
+                # mock LLM output must never be reused once a real key is configured
+                logger.info("LLM ran in mock mode; not checkpointing %s", out_pdf)
 
         # send to telegram
-        sent = send_to_telegram(out_pdf, caption=f"Daily Market Summary - {today}")
+        sent = await loop.run_in_executor(None, send_to_telegram, out_pdf, f"Daily Market Summary - {today}")
 
         return True
+    except LLMError:
+        logger.exception("LLM unavailable; aborting run before building the PDF")
+        return False
     except Exception as e:
         logger.exception("CrewAI flow run failed")
         return False
 
+
+def crewai_flow_run() -> bool:
+    return asyncio.run(flow_async())
+
 if __name__ == "__main__":
     import argparse
 